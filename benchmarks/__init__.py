@@ -0,0 +1 @@
+"""Нагрузочные тесты и микробенчмарки для бэкендов project-*/backend."""
@@ -0,0 +1,82 @@
+"""Запуск: python -m benchmarks [--project todo ...] [--scale 1.0] [--output results.json]
+
+Сравнение с эталоном: python -m benchmarks --baseline baseline.json
+(код выхода 1, если p50/p99 успешных ответов или пропускная способность
+ухудшились больше --tolerance).
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from .harness import run_scenario
+from .scenarios import SCENARIOS
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if (base["scale"], base["concurrency"]) != (result["scale"], result["concurrency"]):
+            print(f"WARNING {name}: baseline was run with other --scale/--concurrency", file=sys.stderr)
+        if result["ok_throughput_rps"] < base["ok_throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['ok_throughput_rps']} -> {result['ok_throughput_rps']} rps")
+        if result["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: 5xx errors {base.get('errors', 0)} -> {result['errors']}")
+        for op, stats in result["operations"].items():
+            base_op = base["operations"].get(op)
+            if not base_op or not base_op["ok_count"] or not stats["ok_count"]:
+                continue
+            for q in ("p50", "p99"):
+                old, new = base_op["ok_latency_ms"][q], stats["ok_latency_ms"][q]
+                if new > old * (1 + tolerance):
+                    regressions.append(f"{name}.{op}: {q} {old} -> {new} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--project", action="append", choices=sorted(SCENARIOS), help="по умолчанию все проекты")
+    parser.add_argument("--scale", type=float, default=1.0, help="доля от полного объёма данных (1M задач, 10M ссылок, ...)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="куда сохранить JSON с результатами")
+    parser.add_argument("--baseline", help="JSON предыдущего запуска для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.project or sorted(SCENARIOS):
+        # Каждый сценарий — в свежем процессе: чистые модули и честный peak RSS
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(
+                run_scenario, SCENARIOS[name], args.scale, args.concurrency, args.duration, args.warmup, args.seed
+            )
+            results[name] = future.result()
+        result = results[name]
+        print(f"{name}: {result['ok_throughput_rps']} ok rps, p50={result['ok_latency_ms']['p50']} ms, "
+              f"p99={result['ok_latency_ms']['p99']} ms, errors={result['errors']}, rss={result['peak_rss_mb']} MB",
+              file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Бюджет холодного старта: время от импорта main.py до готовности (/readyz).
+
+Запуск: python -m benchmarks.coldstart [--project poll ...] [--repeat 5]
+
+Каждый замер — свежий интерпретатор. Код выхода 1, если медиана
+времени до готовности превышает бюджет проекта, загрузка данных упала
+или приложение не стало готовым за DEADLINE_FACTOR бюджетов.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from .harness import REPO_ROOT
+from .scenarios import SCENARIOS
+
+# Бюджеты в секундах: импорт + lifespan + загрузка данных
+DEFAULT_BUDGET_S = 1.0
+BUDGETS_S = {
+    "poll": 1.5,
+}
+# Дольше этого (в бюджетах) готовности не ждём: зависший старт — тоже провал
+DEADLINE_FACTOR = 5
+# Запас на запуск и завершение интерпретатора сверх дедлайна ожидания
+CHILD_GRACE_S = 10
+
+# Выполняется в дочернем процессе: до замера импортируется только stdlib
+CHILD = """
+import asyncio, importlib.util, json, os, sys, time
+start = time.perf_counter()
+workdir, backend, deadline = sys.argv[1], sys.argv[2], float(sys.argv[3])
+os.chdir(workdir)
+sys.path.insert(0, backend)
+spec = importlib.util.spec_from_file_location("main", os.path.join(backend, "main.py"))
+module = importlib.util.module_from_spec(spec)
+sys.modules["main"] = module
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+
+async def startup():
+    async with module.app.router.lifespan_context(module.app):
+        started = time.perf_counter()
+        readiness = module.app.state.readiness
+        while not readiness.ready:
+            tasks = readiness.as_dict()["tasks"]
+            failed = [f"{name}: {task.get('error')}" for name, task in tasks.items() if task["state"] == "failed"]
+            if failed:
+                return started, None, "load failed: " + "; ".join(failed)
+            if time.perf_counter() - start > deadline:
+                return started, None, f"not ready after {deadline} s"
+            await asyncio.sleep(0.001)
+        return started, time.perf_counter(), None
+
+started, ready, error = asyncio.run(startup())
+if error:
+    print(json.dumps({"error": error}))
+    sys.exit(1)
+print(json.dumps({"import_s": imported - start, "startup_s": started - imported, "ready_s": ready - start}))
+"""
+
+
+def run_child(workdir: str, backend: str, env: dict, deadline: float) -> dict:
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-c", CHILD, workdir, backend, str(deadline)],
+            env=env, capture_output=True, text=True, timeout=deadline + CHILD_GRACE_S,
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"no result after {deadline + CHILD_GRACE_S} s"}
+    lines = completed.stdout.strip().splitlines()
+    if lines and lines[-1].startswith("{"):
+        return json.loads(lines[-1])
+    # Упал до вывода результата (например, при импорте): последняя строка трейсбека
+    stderr = completed.stderr.strip().splitlines()
+    return {"error": stderr[-1] if stderr else f"exit code {completed.returncode}"}
+
+
+def measure(name: str, scale: float, repeat: int, budget: float) -> dict:
+    scenario = SCENARIOS[name]
+    backend = os.path.join(REPO_ROOT, scenario.directory, "backend")
+    runs = []
+    with tempfile.TemporaryDirectory(prefix=f"coldstart-{name}-") as workdir:
+        if scenario.prepare:
+            scenario.prepare(workdir, scale)
+        # Как при обычном запуске: пакет instrumentation находится через PYTHONPATH
+        pythonpath = os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")]))
+        env = {**os.environ, **scenario.env, "PYTHONPATH": pythonpath}
+        for _ in range(repeat):
+            run = run_child(workdir, backend, env, budget * DEADLINE_FACTOR)
+            if "error" in run:
+                return run
+            runs.append(run)
+    return {key: round(statistics.median(run[key] for run in runs), 4) for key in ("import_s", "startup_s", "ready_s")}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.coldstart")
+    parser.add_argument("--project", action="append", choices=sorted(SCENARIOS), help="по умолчанию все проекты")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results, over_budget = {}, []
+    for name in args.project or sorted(SCENARIOS):
+        budget = BUDGETS_S.get(name, DEFAULT_BUDGET_S)
+        result = results[name] = measure(name, args.scale, args.repeat, budget)
+        result["budget_s"] = budget
+        if "error" in result:
+            over_budget.append(f"{name}: {result['error']}")
+        elif result["ready_s"] > result["budget_s"]:
+            over_budget.append(f"{name}: ready in {result['ready_s']} s, budget {result['budget_s']} s")
+
+    print(json.dumps(results, indent=2))
+    for line in over_budget:
+        print(f"OVER BUDGET {line}", file=sys.stderr)
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import asyncio
+import importlib.util
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+from .scenarios import Scenario
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app(scenario: Scenario, workdir: str):
+    """Импортирует project-*/backend/main.py так же, как это делает uvicorn.
+
+    Приложения открывают файлы по относительным путям (polls.json, data/,
+    static/), поэтому рабочей папкой становится временная директория.
+    Пакет instrumentation берётся из корня репозитория, как при PYTHONPATH.
+    """
+    backend = os.path.join(REPO_ROOT, scenario.directory, "backend")
+    os.environ.update(scenario.env)
+    os.chdir(workdir)
+    sys.path[:0] = [backend, REPO_ROOT]
+    spec = importlib.util.spec_from_file_location("main", os.path.join(backend, "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["main"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(latencies: List[float], q: int) -> float:
+    if len(latencies) < 2:
+        return latencies[0] if latencies else 0.0
+    return statistics.quantiles(latencies, n=100)[q - 1]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    return {"p50": round(percentile(latencies, 50), 3), "p99": round(percentile(latencies, 99), 3)}
+
+
+def is_ok(status_code: int) -> bool:
+    return status_code < 400
+
+
+async def drive(app, scenario: Scenario, state: dict, concurrency: int, duration: float, warmup: float) -> dict:
+    weights = [w for w, _, _ in scenario.operations]
+    latencies: Dict[str, List[float]] = {name: [] for _, name, _ in scenario.operations}
+    # Быстрые 404/500 не должны улучшать задержку: успешные ответы считаются отдельно
+    ok_latencies: Dict[str, List[float]] = {name: [] for _, name, _ in scenario.operations}
+    statuses: Dict[str, Dict[int, int]] = {name: {} for _, name, _ in scenario.operations}
+    measuring = False
+
+    async def worker(client: httpx.AsyncClient, rng: random.Random, deadline: float):
+        while time.perf_counter() < deadline:
+            _, name, operation = rng.choices(scenario.operations, weights)[0]
+            start = time.perf_counter()
+            response = await operation(client, state)
+            if measuring:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                latencies[name].append(elapsed_ms)
+                if is_ok(response.status_code):
+                    ok_latencies[name].append(elapsed_ms)
+                statuses[name][response.status_code] = statuses[name].get(response.status_code, 0) + 1
+
+    # Исключения приложения превращаются в 500 и попадают в статистику, а не роняют прогон
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        if warmup:
+            await asyncio.gather(*(worker(client, random.Random(i), time.perf_counter() + warmup) for i in range(concurrency)))
+        measuring = True
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client, random.Random(1000 + i), start + duration) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    all_ok_latencies = [value for values in ok_latencies.values() for value in values]
+    errors = sum(count for codes in statuses.values() for code, count in codes.items() if code >= 500)
+    return {
+        "requests": len(all_latencies),
+        "errors": errors,
+        "throughput_rps": round(len(all_latencies) / elapsed, 1),
+        "ok_throughput_rps": round(len(all_ok_latencies) / elapsed, 1),
+        "latency_ms": summarize(all_latencies),
+        "ok_latency_ms": summarize(all_ok_latencies),
+        "operations": {
+            name: {
+                "count": len(values),
+                "ok_count": len(ok_latencies[name]),
+                "latency_ms": summarize(values),
+                "ok_latency_ms": summarize(ok_latencies[name]),
+                "statuses": statuses[name],
+            }
+            for name, values in latencies.items()
+        },
+    }
+
+
+async def run_app(module, scenario: Scenario, scale: float, concurrency: int, duration: float, warmup: float) -> dict:
+    start = time.perf_counter()
+    async with module.app.router.lifespan_context(module.app):
+        # Наполняем после startup: некоторые приложения загружают данные в нём
+        state: dict = {}
+        if scenario.seed:
+            scenario.seed(module, scale, state)
+        seed_seconds = time.perf_counter() - start
+        result = await drive(module.app, scenario, state, concurrency, duration, warmup)
+    return {"seed_s": round(seed_seconds, 3), **result}
+
+
+def run_scenario(scenario: Scenario, scale: float, concurrency: int, duration: float, warmup: float, seed: int) -> dict:
+    """Запускается в отдельном процессе: peak RSS относится к одному приложению."""
+    random.seed(seed)
+    with tempfile.TemporaryDirectory(prefix=f"bench-{scenario.name}-") as workdir:
+        start = time.perf_counter()
+        if scenario.prepare:
+            scenario.prepare(workdir, scale)
+        module = load_app(scenario, workdir)
+        prepare_seconds = time.perf_counter() - start
+        result = asyncio.run(run_app(module, scenario, scale, concurrency, duration, warmup))
+        result["seed_s"] = round(result["seed_s"] + prepare_seconds, 3)
+
+    # ru_maxrss в Linux измеряется в КиБ, в macOS — в байтах
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = max_rss / 1024 / 1024 if sys.platform == "darwin" else max_rss / 1024
+    return {
+        "scale": scale,
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "peak_rss_mb": round(peak_rss_mb, 1),
+        **result,
+    }
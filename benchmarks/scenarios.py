@@ -0,0 +1,303 @@
+"""Сценарии нагрузки для каждого бэкенда.
+
+Scenario описывает, как подготовить рабочую папку до импорта приложения
+(prepare), как наполнить его данными после импорта (seed) и какую смесь
+запросов гонять (operations: вес, имя, корутина).
+"""
+import asyncio
+import json
+import os
+import random
+import types
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+Operation = Callable[[httpx.AsyncClient, dict], Awaitable[httpx.Response]]
+
+WORDS = ["alpha", "pro", "smart", "classic", "код", "книга", "часы", "наушники", "худи", "джинсы", "ноутбук", "смартфон"]
+CATEGORIES = ["Электроника", "Одежда", "Книги", "Дом", "Спорт"]
+
+
+@dataclass
+class Scenario:
+    name: str
+    directory: str
+    operations: List[Tuple[int, str, Operation]]
+    prepare: Optional[Callable[[str, float], None]] = None
+    seed: Optional[Callable[[object, float, dict], None]] = None
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+def scaled(count: int, scale: float) -> int:
+    return max(1, int(count * scale))
+
+
+def pick(state: dict, key: str):
+    return random.choice(state[key])
+
+
+# --- project-1: todo (1M задач) ---
+def seed_todos(module, scale: float, state: dict):
+    todos = [
+        module.TodoItem.model_construct(id=str(uuid.uuid4()), task=f"Задача {i}", completed=i % 3 == 0)
+        for i in range(scaled(1_000_000, scale))
+    ]
+    module.fake_todo_db.extend(todos)
+    state["ids"] = [t.id for t in todos]
+
+
+async def todo_create(client, state):
+    return await client.post("/api/todos", json={"task": "Новая задача"})
+
+
+async def todo_toggle(client, state):
+    return await client.patch(f"/api/todos/{pick(state, 'ids')}")
+
+
+async def todo_rename(client, state):
+    return await client.put(f"/api/todos/{pick(state, 'ids')}", json={"task": "Переименовано"})
+
+
+async def todo_missing(client, state):
+    # Худший случай линейного поиска: проход по всему списку
+    return await client.patch(f"/api/todos/{uuid.uuid4()}")
+
+
+# --- project-2: blog ---
+async def blog_list(client, state):
+    return await client.get("/api/posts")
+
+
+async def blog_post(client, state):
+    return await client.get(f"/api/posts/{random.choice(['first-post', 'second-post', 'missing'])}")
+
+
+# --- project-3: weather (openweathermap подменяется заглушкой) ---
+UPSTREAM_LATENCY = float(os.getenv("BENCH_UPSTREAM_LATENCY_MS", "20")) / 1000
+
+
+async def openweather_stub(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(UPSTREAM_LATENCY)
+    weather = [{"description": "ясно", "icon": "01d"}]
+    if request.url.path.endswith("/forecast"):
+        items = [
+            {"dt_txt": f"2025-06-{day:02d} {hour:02d}:00:00", "main": {"temp": 20.5}, "weather": weather}
+            for day in range(1, 6)
+            for hour in range(0, 24, 3)
+        ]
+        return httpx.Response(200, json={"list": items})
+    return httpx.Response(200, json={"name": request.url.params.get("q", "Coords"), "main": {"temp": 21.3}, "weather": weather})
+
+
+class StubAsyncClient(httpx.AsyncClient):
+    def __init__(self, **kwargs):
+        super().__init__(transport=httpx.MockTransport(openweather_stub), **kwargs)
+
+
+def seed_weather(module, scale: float, state: dict):
+    module.httpx = types.SimpleNamespace(AsyncClient=StubAsyncClient)
+
+
+async def weather_city(client, state):
+    return await client.get(f"/api/weather/{random.choice(['Almaty', 'Astana', 'Shymkent'])}")
+
+
+async def weather_forecast(client, state):
+    return await client.get(f"/api/forecast/{random.choice(['Almaty', 'Astana', 'Shymkent'])}")
+
+
+# --- project-4: url shortener (10M ссылок) ---
+def seed_links(module, scale: float, state: dict):
+    now = datetime.utcnow()
+    codes = []
+    for i in range(scaled(10_000_000, scale)):
+        code = f"c{i:x}"
+        module.url_db[code] = {"long_url": f"https://example.com/page/{i}", "clicks": 0, "created_at": now}
+        codes.append(code)
+    state["codes"] = codes
+
+
+async def link_shorten(client, state):
+    return await client.post("/api/shorten", json={"long_url": f"https://example.com/new/{random.random()}"})
+
+
+async def link_redirect(client, state):
+    return await client.get(f"/{pick(state, 'codes')}", follow_redirects=False)
+
+
+async def link_info(client, state):
+    return await client.get(f"/api/info/{pick(state, 'codes')}")
+
+
+# --- project-5: polls (тысячи опросов) ---
+def prepare_polls(workdir: str, scale: float):
+    polls = [
+        {"id": i, "question": f"Вопрос {i}?", "options": ["Да", "Нет", "Не знаю"], "votes": [i % 7, i % 5, i % 3]}
+        for i in range(1, scaled(5_000, scale) + 1)
+    ]
+    with open(os.path.join(workdir, "polls.json"), "w", encoding="utf-8") as f:
+        json.dump(polls, f, ensure_ascii=False)
+
+
+def seed_polls(module, scale: float, state: dict):
+    module.ensure_polls_loaded()
+    state["poll_ids"] = [p["id"] for p in module.polls]
+
+
+async def poll_get(client, state):
+    return await client.get(f"/api/poll/{pick(state, 'poll_ids')}")
+
+
+async def poll_vote(client, state):
+    return await client.post(f"/api/poll/{pick(state, 'poll_ids')}/vote/{random.randrange(3)}")
+
+
+async def poll_create(client, state):
+    return await client.post("/api/poll/create", json={"question": "Новый?", "options": ["A", "B"]})
+
+
+async def poll_list(client, state):
+    return await client.get("/api/polls")
+
+
+# --- project-6: image gallery ---
+PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def prepare_gallery(workdir: str, scale: float):
+    image_dir = os.path.join(workdir, "static", "images")
+    os.makedirs(image_dir, exist_ok=True)
+    for _ in range(scaled(1_000, scale)):
+        with open(os.path.join(image_dir, f"{uuid.uuid4()}.png"), "wb") as f:
+            f.write(PNG_BYTES)
+
+
+async def gallery_upload(client, state):
+    return await client.post("/api/upload", files={"file": ("bench.png", PNG_BYTES, "image/png")})
+
+
+async def gallery_list(client, state):
+    return await client.get("/api/images")
+
+
+# --- project-7: guestbook (100k записей) ---
+def prepare_guestbook(workdir: str, scale: float):
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    entries = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Гость {i}",
+            "message": f"Сообщение номер {i}. " * 3,
+            "timestamp": (start + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(scaled(100_000, scale))
+    ]
+    with open(os.path.join(workdir, "data", "guestbook.json"), "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=4, ensure_ascii=False)
+
+
+async def guestbook_page(client, state):
+    return await client.get("/api/entries", params={"page": random.randint(1, 100), "limit": 10})
+
+
+async def guestbook_create(client, state):
+    return await client.post("/api/entries", json={"name": "Бенчмарк", "message": "Привет!"})
+
+
+# --- project-8: product filter (1M товаров) ---
+def seed_products(module, scale: float, state: dict):
+    rng = random.Random(42)
+    module.PRODUCTS_DB = [
+        {
+            "id": i,
+            "name": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {i}",
+            "category": rng.choice(CATEGORIES),
+            "price": rng.randint(5, 2_000),
+        }
+        for i in range(1, scaled(1_000_000, scale) + 1)
+    ]
+
+
+async def products_search(client, state):
+    return await client.get("/api/products", params={"search": random.choice(WORDS), "category": random.choice(CATEGORIES)})
+
+
+async def products_price(client, state):
+    return await client.get("/api/products", params={"min_price": 100, "max_price": 150, "sort": "price_asc"})
+
+
+async def products_categories(client, state):
+    return await client.get("/api/categories")
+
+
+# --- project-9: simple auth ---
+def seed_auth(module, scale: float, state: dict):
+    # Лимиты входа отключены, иначе смесь упрётся в 429 с одного IP
+    module.username_limiter = module.security.RateLimiter(rate=1e9, capacity=10**9)
+    module.ip_limiter = module.security.RateLimiter(rate=1e9, capacity=10**9)
+
+
+async def auth_login(client, state):
+    return await client.post("/api/login", data={"username": "user", "password": "password"})
+
+
+async def auth_secret(client, state):
+    if "token" not in state:
+        state["token"] = (await auth_login(client, state)).json()["access_token"]
+    return await client.get("/api/secret-data", headers={"Authorization": f"Bearer {state['token']}"})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in [
+        Scenario(
+            "todo", "project-1-fullstack-todo",
+            [(50, "toggle", todo_toggle), (30, "rename", todo_rename), (15, "create", todo_create), (5, "missing", todo_missing)],
+            seed=seed_todos,
+        ),
+        Scenario("blog", "project-2-minimalist-blog", [(50, "list", blog_list), (50, "post", blog_post)]),
+        Scenario(
+            "weather", "project-3-weather-app",
+            [(70, "weather", weather_city), (30, "forecast", weather_forecast)],
+            seed=seed_weather, env={"OPENWEATHER_API_KEY": "benchmark"},
+        ),
+        Scenario(
+            "shortener", "project-4-url-shortener",
+            [(80, "redirect", link_redirect), (10, "info", link_info), (10, "shorten", link_shorten)],
+            seed=seed_links,
+        ),
+        Scenario(
+            "poll", "project-5-real-time-poll",
+            [(60, "get", poll_get), (30, "vote", poll_vote), (8, "create", poll_create), (2, "list", poll_list)],
+            prepare=prepare_polls, seed=seed_polls,
+        ),
+        Scenario(
+            "gallery", "project-6-image-gallery",
+            [(80, "list", gallery_list), (20, "upload", gallery_upload)],
+            prepare=prepare_gallery,
+        ),
+        Scenario(
+            "guestbook", "project-7-json-guestbook",
+            [(80, "page", guestbook_page), (20, "create", guestbook_create)],
+            prepare=prepare_guestbook,
+        ),
+        Scenario(
+            "products", "project-8-product-filter",
+            [(45, "search", products_search), (45, "price", products_price), (10, "categories", products_categories)],
+            seed=seed_products,
+        ),
+        Scenario(
+            "auth", "project-9-simple-auth",
+            [(95, "secret", auth_secret), (5, "login", auth_login)],
+            seed=seed_auth,
+        ),
+    ]
+}
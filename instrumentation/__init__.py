@@ -0,0 +1,67 @@
+"""Общая инструментация производительности для бэкендов проектов.
+
+Подключение в main.py:
+
+    app = FastAPI()
+    instrument_app(app)  # до объявления эндпоинтов
+
+Метрики доступны на /metrics в текстовом формате Prometheus, проверки
+живости и готовности — на /healthz и /readyz.
+"""
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from .health import LoadTask, Readiness
+from .middleware import MetricsMiddleware
+from .profiler import PROFILER_ENABLED, SamplingProfiler
+from .registry import REGISTRY, Registry
+from .timing import timed, timer
+
+__all__ = [
+    "instrument_app",
+    "timed",
+    "timer",
+    "LoadTask",
+    "MetricsMiddleware",
+    "Readiness",
+    "Registry",
+    "REGISTRY",
+    "SamplingProfiler",
+]
+
+
+def instrument_app(app: FastAPI, registry: Registry = REGISTRY) -> Readiness:
+    """Добавляет middleware метрик, /metrics, /healthz, /readyz и (опционально) профилировщик.
+
+    Вызывать нужно сразу после создания приложения: маршруты регистрируются
+    раньше «ловящих всё» путей вроде /{short_code}. Возвращает Readiness,
+    в котором приложение отмечает загрузку своих данных.
+    """
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    readiness = app.state.readiness = Readiness()
+
+    @app.get("/healthz", include_in_schema=False)
+    async def healthz():
+        return {"status": "ok"}
+
+    @app.get("/readyz", include_in_schema=False)
+    async def readyz():
+        return JSONResponse(readiness.as_dict(), status_code=200 if readiness.ready else 503)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    if PROFILER_ENABLED:
+        profiler = SamplingProfiler()
+
+        @app.post("/debug/profiler/start", include_in_schema=False)
+        async def start_profiler():
+            profiler.start()
+            return {"detail": "Profiler started"}
+
+        @app.post("/debug/profiler/stop", include_in_schema=False)
+        async def stop_profiler():
+            return PlainTextResponse(profiler.stop())
+
+    return readiness
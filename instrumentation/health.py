@@ -0,0 +1,59 @@
+import time
+from threading import Lock
+from typing import Dict, Optional
+
+
+class LoadTask:
+    """Прогресс загрузки одного набора данных (опросы, каталог и т.п.)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "pending"
+        self.loaded = 0
+        self.error: Optional[str] = None
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def start(self):
+        self.state = "loading"
+        self._started = time.monotonic()
+
+    def finish(self, loaded: int):
+        self.loaded = loaded
+        self.state = "ready"
+        self._finished = time.monotonic()
+
+    def fail(self, error: Exception):
+        self.state = "failed"
+        self.error = str(error)
+        self._finished = time.monotonic()
+
+    def as_dict(self) -> dict:
+        info = {"state": self.state, "loaded": self.loaded}
+        if self._started is not None:
+            info["seconds"] = round((self._finished or time.monotonic()) - self._started, 3)
+        if self.error:
+            info["error"] = self.error
+        return info
+
+
+class Readiness:
+    """Приложение готово, когда загружены все зарегистрированные данные."""
+
+    def __init__(self):
+        self._tasks: Dict[str, LoadTask] = {}
+        self._lock = Lock()
+
+    def task(self, name: str) -> LoadTask:
+        with self._lock:
+            return self._tasks.setdefault(name, LoadTask(name))
+
+    @property
+    def ready(self) -> bool:
+        return all(task.state == "ready" for task in self._tasks.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "loading",
+            "tasks": {name: task.as_dict() for name, task in self._tasks.items()},
+        }
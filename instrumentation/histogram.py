@@ -0,0 +1,43 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Iterator, List, Sequence, Tuple
+
+# Границы le для экспорта в Prometheus (в единицах экспорта). Набор
+# фиксированный и выводится целиком: иначе у каждой серии свои le,
+# и rate()/histogram_quantile() по ним дают мусор.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Гистограмма целых неотрицательных значений (мкс, байты и т.п.).
+
+    scale переводит сырые значения в единицы экспорта,
+    например 1e-6 для микросекунд -> секунды. Границы bounds заданы
+    в единицах экспорта; квантили считает Prometheus (histogram_quantile).
+    """
+
+    def __init__(self, scale: float = 1, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.scale = scale
+        self.count = 0
+        self.total = 0
+        self.bounds = tuple(bounds)
+        self._raw_bounds = [bound / scale for bound in self.bounds]
+        self._counts: List[int] = [0] * (len(self.bounds) + 1)  # последний — выше всех границ
+        self._lock = Lock()
+
+    def record(self, value: int):
+        index = bisect_left(self._raw_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    def buckets(self) -> Iterator[Tuple[float, int]]:
+        """Пары (граница le, накопленное количество) для всех bounds."""
+        with self._lock:
+            counts = self._counts[:-1]
+        cumulative = 0
+        for bound, count in zip(self.bounds, counts):
+            cumulative += count
+            yield bound, cumulative
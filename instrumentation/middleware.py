@@ -0,0 +1,77 @@
+import time
+
+from .histogram import LATENCY_BUCKETS, SIZE_BUCKETS
+from .registry import REGISTRY, Registry
+
+
+class MetricsMiddleware:
+    """ASGI-middleware: задержка, размеры тел и число запросов в работе.
+
+    Написано на чистом ASGI, а не через BaseHTTPMiddleware, чтобы не
+    добавлять лишнюю задачу и буферизацию на каждый запрос.
+    """
+
+    def __init__(self, app, registry: Registry = REGISTRY):
+        self.app = app
+        self.registry = registry
+        self.in_flight = registry.gauge("http_requests_in_flight", "Requests currently being processed")
+
+    @staticmethod
+    def _route_label(scope, root_path: str) -> str:
+        # Шаблон пути ("/api/todos/{todo_id}"), а не сам путь, чтобы не плодить метки
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        # Mount (StaticFiles и т.п.) не выставляет route, но дописывает свой
+        # префикс к root_path: по нему смонтированное приложение получает свою метку
+        mount_path = scope.get("root_path", "")[len(root_path):]
+        return mount_path or "<unmatched>"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        request_size = 0
+        response_size = 0
+
+        async def receive_wrapper():
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        root_path = scope.get("root_path", "")
+        self.in_flight.inc()
+        start = time.perf_counter_ns()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            elapsed_us = (time.perf_counter_ns() - start) // 1000
+            self.in_flight.dec()
+            route = self._route_label(scope, root_path)
+            labels = {"method": scope["method"], "route": route}
+            self.registry.histogram(
+                "http_request_duration_seconds",
+                "Request latency",
+                scale=1e-6,
+                buckets=LATENCY_BUCKETS,
+                status=str(status_code),
+                **labels,
+            ).record(elapsed_us)
+            self.registry.histogram(
+                "http_request_size_bytes", "Request body size", buckets=SIZE_BUCKETS, **labels
+            ).record(request_size)
+            self.registry.histogram(
+                "http_response_size_bytes", "Response body size", buckets=SIZE_BUCKETS, **labels
+            ).record(response_size)
@@ -0,0 +1,83 @@
+from threading import Lock
+from typing import Dict, List, Sequence, Tuple
+
+from .histogram import LATENCY_BUCKETS, Histogram
+
+Labels = Tuple[Tuple[str, str], ...]
+INF_LABEL = 'le="+Inf"'
+
+
+class Gauge:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def dec(self, amount: int = 1):
+        self.value -= amount
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    return format(value, ".6g") if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """Хранилище метрик с выводом в текстовом формате Prometheus."""
+
+    def __init__(self):
+        self._meta: Dict[str, Tuple[str, str]] = {}  # name: (type, help)
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._gauges: Dict[Tuple[str, Labels], Gauge] = {}
+        self._lock = Lock()
+
+    def histogram(
+        self, name: str, help: str, scale: float = 1, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: str
+    ) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                self._meta.setdefault(name, ("histogram", help))
+                histogram = self._histograms.setdefault(key, Histogram(scale, buckets))
+        return histogram
+
+    def gauge(self, name: str, help: str, **labels: str) -> Gauge:
+        key = (name, tuple(sorted(labels.items())))
+        gauge = self._gauges.get(key)
+        if gauge is None:
+            with self._lock:
+                self._meta.setdefault(name, ("gauge", help))
+                gauge = self._gauges.setdefault(key, Gauge())
+        return gauge
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, (kind, help) in sorted(self._meta.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "gauge":
+                for (metric, labels), gauge in list(self._gauges.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {gauge.value}")
+                continue
+            for (metric, labels), histogram in list(self._histograms.items()):
+                if metric != name:
+                    continue
+                for bound, cumulative in histogram.buckets():
+                    le = 'le="%s"' % _format_number(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, INF_LABEL)} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(histogram.total * histogram.scale)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
@@ -0,0 +1,67 @@
+import functools
+import inspect
+import os
+import time
+
+from .registry import REGISTRY
+
+# Замеры горячих функций включаются явно: PERF_TIMING=1.
+# Когда они выключены, timed() возвращает функцию без обёртки.
+TIMING_ENABLED = os.getenv("PERF_TIMING") == "1"
+
+
+def _record(name: str, start: int):
+    REGISTRY.histogram(
+        "function_duration_seconds", "Duration of instrumented functions", scale=1e-6, function=name
+    ).record((time.perf_counter_ns() - start) // 1000)
+
+
+def timed(name: str = None):
+    """Декоратор для замера времени sync- и async-функций."""
+
+    def decorator(func):
+        if not TIMING_ENABLED:
+            return func
+        label = name or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _record(label, start)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(label, start)
+
+        return wrapper
+
+    return decorator
+
+
+class timer:
+    """Контекстный менеджер для замера участка кода (например, запроса к API)."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        if TIMING_ENABLED:
+            self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        if TIMING_ENABLED:
+            _record(self.name, self.start)
+        return False
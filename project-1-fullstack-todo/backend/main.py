@@ -4,6 +4,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
 
+from instrumentation import instrument_app
+
 # --- App Configuration ---
 app = FastAPI()
 
@@ -21,6 +23,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Metrics ---
+instrument_app(app)
+
 # --- Pydantic Models ---
 class TodoItem(BaseModel):
     id: str
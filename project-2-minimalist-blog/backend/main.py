@@ -3,6 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
 
+from instrumentation import instrument_app
+
 app = FastAPI()
 
 # --- CORS ---
@@ -15,6 +17,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Метрики ---
+instrument_app(app)
+
 # --- Models ---
 class PostBase(BaseModel):
     slug: str
@@ -4,9 +4,9 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
+from instrumentation import instrument_app, timer
+
 load_dotenv()
-API_KEY = os.getenv("OPENWEATHER_API_KEY")
-print("🔑 API_KEY:", API_KEY)
 
 app = FastAPI()
 
@@ -19,6 +19,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Метрики ---
+instrument_app(app)
+
 API_KEY = os.getenv("OPENWEATHER_API_KEY")
 WEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
 FORECAST_BASE_URL = "https://api.openweathermap.org/data/2.5/forecast"
@@ -36,7 +39,8 @@ async def get_weather(city: str):
     }
 
     async with httpx.AsyncClient() as client:
-        response = await client.get(WEATHER_BASE_URL, params=params)
+        with timer("openweather_weather"):
+            response = await client.get(WEATHER_BASE_URL, params=params)
 
     if response.status_code != 200:
         detail = response.json().get("message", "Error fetching weather data")
@@ -64,7 +68,8 @@ async def get_forecast(city: str):
     }
 
     async with httpx.AsyncClient() as client:
-        response = await client.get(FORECAST_BASE_URL, params=params)
+        with timer("openweather_forecast"):
+            response = await client.get(FORECAST_BASE_URL, params=params)
 
     if response.status_code != 200:
         detail = response.json().get("message", "Error fetching forecast")
@@ -97,7 +102,8 @@ async def get_weather_by_coords(lat: float = Query(...), lon: float = Query(...)
     }
 
     async with httpx.AsyncClient() as client:
-        response = await client.get(WEATHER_BASE_URL, params=params)
+        with timer("openweather_weather"):
+            response = await client.get(WEATHER_BASE_URL, params=params)
 
     if response.status_code != 200:
         detail = response.json().get("message", "Error fetching weather data")
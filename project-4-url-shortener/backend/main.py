@@ -5,6 +5,8 @@ from fastapi.responses import RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
 
+from instrumentation import instrument_app
+
 app = FastAPI()
 
 app.add_middleware(
@@ -15,6 +17,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Метрики ---
+instrument_app(app)
+
 # Структура: {short_code: {"long_url": str, "clicks": int, "created_at": datetime}}
 url_db = {}
 
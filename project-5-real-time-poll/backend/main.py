@@ -1,12 +1,24 @@
 import json
+import marshal
 import os
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 from threading import Lock
 
-app = FastAPI()
+from instrumentation import instrument_app, timed
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Опросы загружаются в фоне: сервер сразу принимает трафик,
+    # а запросы, пришедшие раньше, дождутся загрузки в ensure_polls_loaded()
+    threading.Thread(target=ensure_polls_loaded, name="load-polls", daemon=True).start()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # --- Настройка CORS ---
 origins = ["http://localhost:3000"]
@@ -18,23 +30,75 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Метрики ---
+readiness = instrument_app(app)
+
 DATA_FILE = "polls.json"
+SNAPSHOT_FILE = "polls.snapshot"  # бинарная копия polls.json (marshal) для быстрого старта
 polls: List[dict] = []
 poll_id_counter = 1
+polls_loaded = False
+polls_task = readiness.task("polls")  # пока опросы не загружены, /readyz отвечает 503
 lock = Lock()
+load_lock = Lock()
+
+def source_stamp() -> tuple:
+    st = os.stat(DATA_FILE)
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+def read_polls_file() -> list:
+    # Снимок хранит размер, mtime и inode polls.json, из которого он сделан.
+    # Сравнение по одному mtime пропустило бы восстановленный из бэкапа
+    # старый файл или правку во время чтения.
+    source = source_stamp()
+    try:
+        with open(SNAPSHOT_FILE, "rb") as f:
+            snapshot = marshal.loads(f.read())  # loads(bytes) намного быстрее load(file)
+        if snapshot["source"] == source:
+            return snapshot["polls"]
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        polls_data = json.load(f)
+    if source_stamp() != source:
+        return polls_data  # файл меняли, пока мы его читали: такой снимок не сохраняем
+    tmp_file = f"{SNAPSHOT_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(marshal.dumps({"source": source, "polls": polls_data}))
+        os.replace(tmp_file, SNAPSHOT_FILE)
+    except (OSError, ValueError):
+        pass
+    return polls_data
 
 def load_polls():
     global polls, poll_id_counter
     if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            polls_data = json.load(f)
-            polls = polls_data if isinstance(polls_data, list) else []
-            if polls:
-                poll_id_counter = max(p["id"] for p in polls) + 1
+        polls_data = read_polls_file()
+        polls = polls_data if isinstance(polls_data, list) else []
+        if polls:
+            poll_id_counter = max(p["id"] for p in polls) + 1
     else:
         polls = []
         poll_id_counter = 1
 
+def ensure_polls_loaded():
+    global polls_loaded
+    if polls_loaded:
+        return
+    with load_lock:
+        if polls_loaded:
+            return
+        polls_task.start()
+        try:
+            load_polls()
+        except Exception as e:
+            polls_task.fail(e)
+            raise
+        polls_loaded = True
+        polls_task.finish(len(polls))
+
+@timed()
 def save_polls():
     with open("polls.json", "r", encoding="utf-8-sig") as f:
         polls_data = json.load(f)
@@ -50,12 +114,9 @@ class Poll(BaseModel):
     options: List[str]
     votes: List[int]
 
-@app.on_event("startup")
-def startup_event():
-    load_polls()
-
 @app.get("/api/poll/{poll_id}", response_model=Poll)
 def get_poll(poll_id: int):
+    ensure_polls_loaded()
     for poll in polls:
         if poll["id"] == poll_id:
             return poll
@@ -63,11 +124,13 @@ def get_poll(poll_id: int):
 
 @app.get("/api/polls", response_model=List[Poll])
 def get_all_polls():
+    ensure_polls_loaded()
     return polls
 
 @app.post("/api/poll/create", response_model=Poll)
 def create_poll(poll: PollCreate):
     global poll_id_counter
+    ensure_polls_loaded()
     with lock:
         new_poll = {
             "id": poll_id_counter,
@@ -82,6 +145,7 @@ def create_poll(poll: PollCreate):
 
 @app.post("/api/poll/{poll_id}/vote/{option_idx}", response_model=Poll)
 def vote_poll(poll_id: int, option_idx: int):
+    ensure_polls_loaded()
     with lock:
         for poll in polls:
             if poll["id"] == poll_id:
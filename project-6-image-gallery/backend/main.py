@@ -1,24 +1,36 @@
 import os
 import uuid
+from contextlib import asynccontextmanager
 import aiofiles
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List
 
-app = FastAPI()
+from instrumentation import instrument_app
+
+# --- Путь для сохранения изображений ---
+IMAGE_DIR = "static/images/"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Папка создаётся при старте сервера, а не при импорте модуля
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # --- CORS ---
 origins = ["http://localhost:3000"]
 app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
-# --- Путь для сохранения изображений ---
-IMAGE_DIR = "static/images/"
-os.makedirs(IMAGE_DIR, exist_ok=True)
+# --- Метрики ---
+instrument_app(app)
 
 # --- Раздача статических файлов ---
 # Это позволяет получать доступ к файлам по URL, например, http://localhost:8000/static/images/filename.jpg
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# check_dir=False: папка static появляется только в lifespan
+app.mount("/static", StaticFiles(directory="static", check_dir=False), name="static")
 
 
 @app.post("/api/upload")
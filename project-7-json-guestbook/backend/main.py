@@ -1,4 +1,6 @@
+import asyncio
 import json
+import os
 import uuid
 from datetime import datetime, timezone
 from fastapi import FastAPI, HTTPException, Query
@@ -7,13 +9,21 @@ from pydantic import BaseModel
 from typing import List
 import aiofiles
 
+from instrumentation import instrument_app, timed
+
 app = FastAPI()
 
 # --- CORS ---
 origins = ["http://localhost:3000"]
 app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
+# --- Метрики ---
+instrument_app(app)
+
 DB_FILE = "data/guestbook.json"
+# Чтение-изменение-запись файла выполняется под замком, иначе
+# параллельные запросы теряют записи друг друга
+db_lock = asyncio.Lock()
 
 # --- Pydantic модели ---
 class GuestbookEntry(BaseModel):
@@ -30,6 +40,7 @@ class EntryUpdate(BaseModel):
     message: str
 
 # --- Вспомогательные функции для работы с файлом ---
+@timed()
 async def read_db() -> List[GuestbookEntry]:
     async with aiofiles.open(DB_FILE, mode='r', encoding='utf-8') as f:
         content = await f.read()
@@ -38,11 +49,20 @@ async def read_db() -> List[GuestbookEntry]:
         data = json.loads(content)
         return [GuestbookEntry(**item) for item in data]
 
+@timed()
 async def write_db(data: List[GuestbookEntry]):
     # Преобразуем объекты Pydantic в словари для сериализации в JSON
     export_data = [item.model_dump(mode='json') for item in data]
-    async with aiofiles.open(DB_FILE, mode='w', encoding='utf-8') as f:
-        await f.write(json.dumps(export_data, indent=4, ensure_ascii=False))
+    # Пишем во временный файл и подменяем им базу: читатели никогда не видят недописанный JSON
+    tmp_file = f"{DB_FILE}.{uuid.uuid4().hex}.tmp"
+    try:
+        async with aiofiles.open(tmp_file, mode='w', encoding='utf-8') as f:
+            await f.write(json.dumps(export_data, indent=4, ensure_ascii=False))
+        os.replace(tmp_file, DB_FILE)
+    finally:
+        # После неудачной записи временный файл не должен оставаться в data/
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
 
 # --- Эндпоинты API ---
 @app.get("/api/entries", response_model=List[GuestbookEntry])
@@ -56,8 +76,6 @@ async def get_all_entries(page: int = Query(1, ge=1), limit: int = Query(10, ge=
 @app.post("/api/entries", response_model=GuestbookEntry, status_code=201)
 async def create_entry(entry_data: EntryCreate):
     """Добавляет новую запись в гостевую книгу."""
-    entries = await read_db()
-
     new_entry = GuestbookEntry(
         id=str(uuid.uuid4()),
         name=entry_data.name,
@@ -65,26 +83,30 @@ async def create_entry(entry_data: EntryCreate):
         timestamp=datetime.now(timezone.utc)
     )
 
-    entries.append(new_entry)
-    await write_db(entries)
+    async with db_lock:
+        entries = await read_db()
+        entries.append(new_entry)
+        await write_db(entries)
 
     return new_entry
 
 @app.delete("/api/entries/{entry_id}", status_code=204)
 async def delete_entry(entry_id: str):
-    entries = await read_db()
-    new_entries = [entry for entry in entries if entry.id != entry_id]
-    if len(new_entries) == len(entries):
-        raise HTTPException(status_code=404, detail="Entry not found")
-    await write_db(new_entries)
+    async with db_lock:
+        entries = await read_db()
+        new_entries = [entry for entry in entries if entry.id != entry_id]
+        if len(new_entries) == len(entries):
+            raise HTTPException(status_code=404, detail="Entry not found")
+        await write_db(new_entries)
     return
 
 @app.put("/api/entries/{entry_id}", response_model=GuestbookEntry)
 async def update_entry(entry_id: str, update: EntryUpdate):
-    entries = await read_db()
-    for entry in entries:
-        if entry.id == entry_id:
-            entry.message = update.message
-            await write_db(entries)
-            return entry
+    async with db_lock:
+        entries = await read_db()
+        for entry in entries:
+            if entry.id == entry_id:
+                entry.message = update.message
+                await write_db(entries)
+                return entry
     raise HTTPException(status_code=404, detail="Entry not found")
\ No newline at end of file
@@ -3,12 +3,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
 
+from instrumentation import instrument_app, timed
+
 app = FastAPI()
 
 # --- CORS ---
 origins = ["http://localhost:3000"]
 app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
+# --- Метрики ---
+instrument_app(app)
+
 # --- "База данных" в памяти ---
 PRODUCTS_DB = [
     {"id": 1, "name": "Смартфон Alpha", "category": "Электроника", "price": 550},
@@ -31,6 +36,7 @@ class Product(BaseModel):
 
 # --- Эндпоинты API ---
 @app.get("/api/products", response_model=List[Product])
+@timed()
 async def filter_products(
     search: Optional[str] = None,
     category: Optional[str] = None,
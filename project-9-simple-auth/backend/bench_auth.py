@@ -0,0 +1,59 @@
+"""Сравнение скорости проверки токенов в режимах stateful и stateless.
+
+Запуск: PYTHONPATH=../.. python bench_auth.py [--workers 4] [--requests 200000]
+"""
+import argparse
+import asyncio
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Ключ нужен до импорта tokens; воркеры наследуют его через окружение
+os.environ.setdefault("AUTH_SECRET_KEY", secrets.token_hex(32))
+
+import main
+import tokens
+
+
+def run_worker(mode: str, n_requests: int, n_tokens: int, issued: list) -> float:
+    main.AUTH_MODE = mode
+    if mode == "stateful":
+        # В stateful-режиме воркер видит только выданные им самим токены
+        issued = []
+        for i in range(n_tokens):
+            token = f"token-{i}"
+            main.TOKENS[token] = {"username": "user", "role": "user", "created": datetime.utcnow()}
+            issued.append(token)
+    headers = [f"Bearer {t}" for t in issued]
+
+    async def loop():
+        for i in range(n_requests):
+            await main.get_current_user(headers[i % len(headers)])
+
+    start = time.perf_counter()
+    asyncio.run(loop())
+    return time.perf_counter() - start
+
+
+def bench(mode: str, workers: int, n_requests: int, n_tokens: int) -> float:
+    # Stateless-токены выпускаются «другим» процессом и проверяются всеми воркерами
+    issued = [tokens.create_token("user", "user", main.TOKEN_LIFETIME) for _ in range(n_tokens)]
+    per_worker = n_requests // workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_worker, mode, per_worker, n_tokens, issued) for _ in range(workers)]
+        elapsed = max(f.result() for f in futures)
+    return per_worker * workers / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--tokens", type=int, default=500, help="число активных токенов (stateless: больше размера кэша = промахи)")
+    args = parser.parse_args()
+
+    for mode in ("stateful", "stateless"):
+        rps = bench(mode, args.workers, args.requests, args.tokens)
+        print(f"{mode:>10}: {rps:,.0f} проверок/с ({args.workers} воркеров)")
@@ -0,0 +1,115 @@
+"""Нагрузочный тест: задержка /api/secret-data во время потока логинов.
+
+Запуск: PYTHONPATH=../.. python bench_login.py [--flood 64] [--seconds 5] [--inline]
+
+Сервер (uvicorn), поток логинов и замер задержки работают в разных процессах.
+--inline проверяет пароль прямо в event loop (как без пула) для сравнения.
+Лимиты попыток входа на время теста отключены, чтобы нагрузка доходила до пула.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+
+import httpx
+import uvicorn
+
+import main
+import security
+
+HOST = "127.0.0.1"
+
+
+class InlineVerifier:
+    async def verify(self, password: str, stored: str) -> bool:
+        return security.verify_password(password, stored)
+
+
+def serve(port: int, inline: bool):
+    main.username_limiter = security.RateLimiter(rate=1e9, capacity=10**9)
+    main.ip_limiter = security.RateLimiter(rate=1e9, capacity=10**9)
+    if inline:
+        main.password_verifier = InlineVerifier()
+    uvicorn.run(main.app, host=HOST, port=port, log_level="warning")
+
+
+def flood(base_url: str, clients: int, stop, counts):
+    local_counts: dict = {}
+    stopped = False
+
+    async def attacker(client: httpx.AsyncClient):
+        while not stopped:
+            response = await client.post("/api/login", data={"username": "user", "password": "wrong"})
+            local_counts[response.status_code] = local_counts.get(response.status_code, 0) + 1
+
+    async def run():
+        nonlocal stopped
+        limits = httpx.Limits(max_connections=clients)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            tasks = [asyncio.create_task(attacker(client)) for _ in range(clients)]
+            await asyncio.to_thread(stop.wait)
+            stopped = True
+            await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    counts.update(local_counts)
+
+
+def probe(client: httpx.Client, headers: dict, seconds: float) -> list:
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        client.get("/api/secret-data", headers=headers).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+    return latencies
+
+
+def summary(name: str, latencies: list) -> str:
+    q = statistics.quantiles(latencies, n=100)
+    return f"{name:>12}: p50={q[49]:.2f} мс  p99={q[98]:.2f} мс  max={max(latencies):.2f} мс  ({len(latencies)} запросов)"
+
+
+def wait_ready(client: httpx.Client):
+    for _ in range(100):
+        try:
+            client.get("/docs")
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flood", type=int, default=64, help="число параллельных клиентов, перебирающих пароли")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--inline", action="store_true")
+    args = parser.parse_args()
+
+    base_url = f"http://{HOST}:{args.port}"
+    server = multiprocessing.Process(target=serve, args=(args.port, args.inline), daemon=True)
+    server.start()
+    try:
+        with httpx.Client(base_url=base_url, timeout=30) as client:
+            wait_ready(client)
+            login = client.post("/api/login", data={"username": "user", "password": "password"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+            print(summary("без нагрузки", probe(client, headers, args.seconds)))
+
+            with multiprocessing.Manager() as manager:
+                stop, counts = manager.Event(), manager.dict()
+                attacker = multiprocessing.Process(target=flood, args=(base_url, args.flood, stop, counts))
+                attacker.start()
+                time.sleep(0.5)
+                latencies = probe(client, headers, args.seconds)
+                stop.set()
+                attacker.join()
+                print(summary("флуд логинов", latencies))
+                print("ответы /api/login:", dict(sorted(counts.items())))
+    finally:
+        server.terminate()
@@ -1,24 +1,56 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Header
+from fastapi import FastAPI, Depends, HTTPException, Request, status, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from typing import Annotated, Dict, Optional
+import math
+import os
 import uuid
 from datetime import datetime, timedelta
 
+import security
+import tokens
+
+from instrumentation import instrument_app
+
 app = FastAPI()
 
 # --- CORS ---
 origins = ["http://localhost:3000"]
 app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
+# --- Метрики ---
+instrument_app(app)
+
 # --- Фейковые данные ---
 FAKE_USERS = {
-    "user": {"username": "user", "password": "password", "role": "user"},
-    "admin": {"username": "admin", "password": "adminpass", "role": "admin"},
+    # Пароли: "password" и "adminpass" (см. security.hash_password)
+    "user": {
+        "username": "user",
+        "password_hash": "scrypt$9f1c2a7e4b6d8035a1e2c3d4b5f60718$9874710f1a546584449b1cd3ade81376537fb3b8570e47bb9e806b970b00898f7bebbf650f6937512b6886e3673d5620125c15bbfb2952627f287917511acdc7",
+        "role": "user",
+    },
+    "admin": {
+        "username": "admin",
+        "password_hash": "scrypt$2b7d4e91c0a35f68e7d1b2c3a4958670$77d0fe38793f0ddfb8b98bf06256ab02b47049ab15a184c813e3be42e1f0f5ca059a1d5eeba548fbbb931b2416e6dbe89a9738d0bd6e415e9b01fddae17ea896",
+        "role": "admin",
+    },
 }
 TOKENS: Dict[str, Dict[str, str | datetime]] = {}  # token: {"username": str, "role": str, "created": datetime}
 TOKEN_LIFETIME = timedelta(hours=1)
+# "stateful" — токены хранятся в TOKENS (один процесс),
+# "stateless" — подписанные токены, которые проверяет любой воркер
+AUTH_MODE = os.getenv("AUTH_MODE", "stateful")
+if AUTH_MODE == "stateless" and not tokens.SECRET_KEY:
+    raise RuntimeError("AUTH_SECRET_KEY must be set when AUTH_MODE=stateless")
+
+# --- Проверка паролей и ограничение попыток входа ---
+password_verifier = security.PasswordVerifier()
+# Корзина на имя пользователя считает только неудачные попытки, с любых IP:
+# распределённый перебор одного аккаунта упирается в неё. Лимит мягкий,
+# поэтому чужие неудачи блокируют вход настоящему пользователю лишь на минуты.
+username_limiter = security.RateLimiter(rate=20 / 3600, capacity=20)  # 20 неудач, затем 1 в 3 минуты
+ip_limiter = security.RateLimiter(rate=1, capacity=20)  # 20 попыток сразу, затем 1 в секунду с IP
 
 # --- Модель ответа для токена ---
 class Token(BaseModel):
@@ -30,13 +62,21 @@ async def get_current_user(authorization: Annotated[Optional[str], Header()] = N
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication scheme")
     token = authorization.split(" ", 1)[1]
-    token_data = TOKENS.get(token)
-    if not token_data:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    # Проверка времени жизни токена
-    if datetime.utcnow() - token_data["created"] > TOKEN_LIFETIME:
-        del TOKENS[token]
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+    if AUTH_MODE == "stateless":
+        # Подпись и срок действия проверяются без обращения к TOKENS
+        try:
+            payload = tokens.verify_token(token)
+        except tokens.TokenError as e:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+        token_data = {"username": payload["sub"], "role": payload["role"], "expires": datetime.utcfromtimestamp(payload["exp"])}
+    else:
+        token_data = TOKENS.get(token)
+        if not token_data:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        # Проверка времени жизни токена
+        if datetime.utcnow() - token_data["created"] > TOKEN_LIFETIME:
+            del TOKENS[token]
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
     if required_role and token_data["role"] != required_role:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
     return token_data
@@ -44,12 +84,34 @@ async def get_current_user(authorization: Annotated[Optional[str], Header()] = N
 # --- Эндпоинты API ---
 
 @app.post("/api/login", response_model=Token)
-async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
-    for user in FAKE_USERS.values():
-        if form_data.username == user["username"] and form_data.password == user["password"]:
-            token = str(uuid.uuid4())
-            TOKENS[token] = {"username": user["username"], "role": user["role"], "created": datetime.utcnow()}
+async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], request: Request):
+    client_ip = request.client.host if request.client else "unknown"
+    wait = ip_limiter.hit(client_ip) or username_limiter.check(form_data.username)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+    user = FAKE_USERS.get(form_data.username)
+    # Неизвестный логин тоже проходит scrypt: иначе по времени ответа видно, какие логины существуют
+    password_hash = user["password_hash"] if user else security.DUMMY_HASH
+    try:
+        password_ok = await password_verifier.verify(form_data.password, password_hash)
+    except security.PoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login service is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+    if user and password_ok:
+        if AUTH_MODE == "stateless":
+            token = tokens.create_token(user["username"], user["role"], TOKEN_LIFETIME)
             return {"access_token": token, "token_type": "bearer", "role": user["role"]}
+        token = str(uuid.uuid4())
+        TOKENS[token] = {"username": user["username"], "role": user["role"], "created": datetime.utcnow()}
+        return {"access_token": token, "token_type": "bearer", "role": user["role"]}
+    username_limiter.hit(form_data.username)
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Incorrect username or password",
@@ -61,7 +123,9 @@ async def logout(authorization: Annotated[Optional[str], Header()] = None):
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication scheme")
     token = authorization.split(" ", 1)[1]
-    if token in TOKENS:
+    if AUTH_MODE == "stateless":
+        tokens.revoke_token(token)
+    elif token in TOKENS:
         del TOKENS[token]
     return {"detail": "Logged out"}
 
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Tuple
+
+# --- Параметры scrypt ---
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# --- Пул для проверки паролей ---
+HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "2"))
+HASH_QUEUE_LIMIT = int(os.getenv("AUTH_HASH_QUEUE_LIMIT", "16"))
+
+
+# Хэш случайного пароля: с ним сверяются неизвестные имена пользователей,
+# чтобы вход с несуществующим логином стоил столько же, сколько с настоящим
+DUMMY_HASH = "scrypt$0b4f98442746e8692eec6748086d223f$0dcffed6f045e39cf406f5814a01cf5ac740bb3ced483552faa09585c6b75f2189d8b6a6ba8e1329a176849c32b1fb619ff3bb7a0679323e23c27026b0a3018c"
+
+
+class PoolBusy(Exception):
+    """Очередь на проверку пароля переполнена."""
+
+
+def _scrypt(password: str, salt: bytes) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+
+
+def hash_password(password: str) -> str:
+    salt = secrets.token_bytes(16)
+    return f"scrypt${salt.hex()}${_scrypt(password, salt).hex()}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    scheme, salt, expected = stored.split("$")
+    if scheme != "scrypt":
+        return False
+    return hmac.compare_digest(_scrypt(password, bytes.fromhex(salt)), bytes.fromhex(expected))
+
+
+class PasswordVerifier:
+    """Выполняет verify_password в пуле потоков, не блокируя event loop.
+
+    hashlib.scrypt отпускает GIL, поэтому потоков достаточно. Если в работе
+    уже HASH_QUEUE_LIMIT проверок, новая сразу получает PoolBusy (503),
+    а не ждёт в очереди.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_limit: int = HASH_QUEUE_LIMIT):
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._lock = Lock()
+
+    async def verify(self, password: str, stored: str) -> bool:
+        with self._lock:
+            if self._pending >= self.queue_limit:
+                raise PoolBusy()
+            self._pending += 1
+        future = self._executor.submit(verify_password, password, stored)
+        # Счётчик уменьшается, только когда поток действительно закончил (или задача
+        # снята из очереди). Если клиент отключился, await отменится, а хэширование
+        # продолжится, и всё это время задача должна учитываться в лимите.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+
+# --- Ограничение частоты запросов (token bucket) ---
+class RateLimiter:
+    """Token bucket на ключ с жёстким лимитом числа ключей.
+
+    Корзины лежат в OrderedDict в порядке последнего обращения. При
+    переполнении вытесняется самая давняя, поэтому каждый вызов O(1),
+    даже если атакующий перебирает миллионы имён пользователей.
+    """
+
+    def __init__(self, rate: float, capacity: int, max_keys: int = 10_000):
+        self.rate = rate  # токенов в секунду
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key: (tokens, updated)
+        self._lock = Lock()
+
+    def _wait(self, tokens: float) -> float:
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def check(self, key: str) -> float:
+        """Как hit, но попытку не тратит."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return 0.0
+            tokens, updated = bucket
+            return self._wait(min(self.capacity, tokens + (now - updated) * self.rate))
+
+    def hit(self, key: str) -> float:
+        """Тратит одну попытку. Возвращает 0, если она разрешена, иначе секунды до следующей."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            tokens, updated = bucket if bucket is not None else (self.capacity, now)
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            wait = self._wait(tokens)
+            if not wait:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
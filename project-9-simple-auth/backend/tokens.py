@@ -0,0 +1,233 @@
+import base64
+import hashlib
+import heapq
+import hmac
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import timedelta
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# --- Настройки подписи ---
+# Все воркеры должны использовать один и тот же ключ, иначе токен,
+# выданный одним процессом, не пройдёт проверку в другом.
+# Значения по умолчанию нет: ключ из репозитория позволил бы подделать любой токен.
+SECRET_KEY = os.getenv("AUTH_SECRET_KEY", "").encode()
+CACHE_SIZE = 1024
+
+
+class TokenError(Exception):
+    """Токен не прошёл проверку (подпись, формат или срок действия)."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    """Принимает только каноническую запись без "=" и лишних символов.
+
+    Иначе один токен можно записать несколькими строками (token + "=" и т.п.),
+    и каждая из них займёт своё место в кэше.
+    """
+    decoded = base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    if _b64encode(decoded) != data:
+        raise ValueError("non-canonical base64")
+    return decoded
+
+
+def _sign(signing_input: bytes) -> bytes:
+    return hmac.new(SECRET_KEY, signing_input, hashlib.sha256).digest()
+
+
+_HEADER = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+
+
+# --- LRU-кэш уже проверенных токенов ---
+class VerifiedTokenCache:
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            payload = self._items.get(token)
+            if payload is None:
+                return None
+            if payload["exp"] <= time.time():
+                del self._items[token]
+                return None
+            self._items.move_to_end(token)
+            return payload
+
+    def put(self, token: str, payload: dict):
+        with self._lock:
+            self._items[token] = payload
+            self._items.move_to_end(token)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def discard(self, token: str):
+        with self._lock:
+            self._items.pop(token, None)
+
+
+# --- Список отозванных токенов ---
+# Отзывы дописываются строками "jti exp" в общий файл, который каждый
+# воркер перечитывает не чаще раза в REVOCATION_POLL_INTERVAL секунд.
+# Поэтому выход из системы действует во всех воркерах с задержкой не
+# больше этого интервала. После exp токен и так невалиден: такие записи
+# удаляются из памяти через кучу, а из файла — при его сжатии.
+REVOCATION_FILE = os.getenv("AUTH_REVOCATION_FILE", "revoked_tokens.log")
+REVOCATION_POLL_INTERVAL = float(os.getenv("AUTH_REVOCATION_POLL_INTERVAL", "1"))
+REVOCATION_COMPACT_BYTES = 1024 * 1024
+
+
+class RevocationList:
+    def __init__(self, path: str = REVOCATION_FILE, poll_interval: float = REVOCATION_POLL_INTERVAL):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._revoked: Dict[str, int] = {}
+        self._expiry: List[Tuple[int, str]] = []  # куча (exp, jti)
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._next_poll = 0.0
+        self._lock = Lock()
+
+    def revoke(self, jti: str, exp: int):
+        with self._file_lock():
+            # O_APPEND: строки от разных воркеров не перемешиваются
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, f"{jti} {exp}\n".encode())
+            finally:
+                os.close(fd)
+            self.refresh()
+            if fcntl is not None and os.path.getsize(self.path) > REVOCATION_COMPACT_BYTES:
+                self._compact()
+
+    def is_revoked(self, jti: str) -> bool:
+        if time.monotonic() >= self._next_poll:
+            self.refresh()
+        return jti in self._revoked
+
+    def refresh(self):
+        """Дочитывает новые строки файла и выбрасывает истёкшие записи."""
+        with self._lock:
+            self._next_poll = time.monotonic() + self.poll_interval
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                st = None
+            if st is not None:
+                if st.st_ino != self._inode or st.st_size < self._offset:
+                    # Файл сжали (новый inode) — читаем его заново
+                    self._inode, self._offset = st.st_ino, 0
+                if st.st_size > self._offset:
+                    with open(self.path, "rb") as f:
+                        f.seek(self._offset)
+                        data = f.read()
+                    complete = data.rfind(b"\n") + 1  # недописанную строку дочитаем позже
+                    self._offset += complete
+                    for line in data[:complete].splitlines():
+                        try:
+                            jti, exp = line.decode().split()
+                            exp = int(exp)
+                        except ValueError:
+                            # Битая строка пропускается: иначе проверка токена падала бы
+                            # с 500, а отзывы после неё в этом куске потерялись бы
+                            continue
+                        self._add(jti, exp)
+            self._prune()
+
+    def _add(self, jti: str, exp: int):
+        if self._revoked.get(jti) != exp:
+            self._revoked[jti] = exp
+            heapq.heappush(self._expiry, (exp, jti))
+
+    def _prune(self):
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            exp, jti = heapq.heappop(self._expiry)
+            if self._revoked.get(jti) == exp:
+                del self._revoked[jti]
+
+    def _compact(self):
+        # Вызывается под _file_lock: никто не дописывает файл, пока он подменяется
+        tmp_path = f"{self.path}.tmp"
+        with self._lock, open(tmp_path, "w") as f:
+            f.writelines(f"{jti} {exp}\n" for jti, exp in self._revoked.items())
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            # Без fcntl (Windows) дозапись остаётся атомарной, а сжатие отключено
+            yield
+            return
+        with open(f"{self.path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+cache = VerifiedTokenCache()
+revoked = RevocationList()
+
+
+def create_token(username: str, role: str, lifetime: timedelta) -> str:
+    payload = {
+        "sub": username,
+        "role": role,
+        "exp": int(time.time() + lifetime.total_seconds()),
+        "jti": uuid.uuid4().hex,
+    }
+    body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    signing_input = f"{_HEADER}.{body}"
+    return f"{signing_input}.{_b64encode(_sign(signing_input.encode()))}"
+
+
+def decode_token(token: str) -> dict:
+    """Проверяет подпись и срок действия без обращения к кэшу."""
+    try:
+        header, body, signature = token.split(".")
+        expected = _sign(f"{header}.{body}".encode())
+        if header != _HEADER or not hmac.compare_digest(_b64decode(signature), expected):
+            raise TokenError("Invalid token")
+        payload = json.loads(_b64decode(body))
+    except (ValueError, TypeError):
+        raise TokenError("Invalid token")
+    if payload["exp"] <= time.time():
+        raise TokenError("Token expired")
+    return payload
+
+
+def verify_token(token: str) -> dict:
+    payload = cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        cache.put(token, payload)
+    if revoked.is_revoked(payload["jti"]):
+        raise TokenError("Invalid token")
+    return payload
+
+
+def revoke_token(token: str):
+    try:
+        payload = decode_token(token)
+    except TokenError:
+        return
+    cache.discard(token)
+    revoked.revoke(payload["jti"], payload["exp"])